@@ -1,115 +1,900 @@
 import os
+import re
 import json
-from typing import Dict, Any
+import time
+import asyncio
+import hashlib
+import logging
+import weakref
+import contextlib
+import threading
+import functools
+import contextvars
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Any,
+    AsyncIterator,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from cachetools import TTLCache
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    import numpy as np
+    from langchain_core.runnables import RunnableBinding
+    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+    # What a tier resolves to: a model, or a model with bound call kwargs
+    ChatModel = Union[ChatOpenAI, RunnableBinding]
+
+# LangChain, httpx, dotenv and numpy are imported on first use (see _get_llm),
+# so importing brand_tools stays cheap for callers that never reach the LLM
+# (scripts that only build context, serverless cold starts, etc.).
+
+# Fewer retries than the SDK default (with its exponential backoff) so a burst
+# of 429s fails fast instead of quietly multiplying latency.
+LLM_MAX_RETRIES = 2
 
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage, HumanMessage
 
 # --------------------------------------------------------------------
 # LOAD ENV VARIABLES (for OPENAI_API_KEY from .env)
 # --------------------------------------------------------------------
-load_dotenv()
+@functools.lru_cache(maxsize=None)
+def load_env() -> None:
+    """
+    Load .env and check OPENAI_API_KEY. brand_tools calls this before its first
+    model call; code that builds its own OpenAI() client must call it first.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    if not os.getenv("OPENAI_API_KEY"):
+        raise ValueError(
+            "OPENAI_API_KEY is not set. "
+            "Make sure it is in your .env file or environment variables."
+        )
+
+
+# --------------------------------------------------------------------
+# SHARED HTTP CONNECTION POOL
+# --------------------------------------------------------------------
+# One keep-alive pool (HTTP/2) shared by every sync model client, so parallel
+# tool calls reuse warm TLS connections instead of opening new ones per burst.
+def _http_settings() -> Dict[str, Any]:
+    import httpx
+
+    return {
+        "http2": True,
+        "limits": httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        "timeout": httpx.Timeout(60.0, connect=5.0),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _http_client():
+    import httpx
 
-if not os.getenv("OPENAI_API_KEY"):
-    raise ValueError(
-        "OPENAI_API_KEY is not set. "
-        "Make sure it is in your .env file or environment variables."
+    return httpx.Client(**_http_settings())
+
+
+def _chat_model(
+    temperature: float,
+    http_async_client: Any = None,
+    model: str = "gpt-4o-mini",
+) -> "ChatOpenAI":
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        max_retries=LLM_MAX_RETRIES,
+        stream_usage=True,
+        http_client=_http_client(),
+        http_async_client=http_async_client,
     )
 
-# Single shared LLM for all tools
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.35,
+
+# --------------------------------------------------------------------
+# MODEL TIERS (per-tool routing)
+# --------------------------------------------------------------------
+# Each tool picks a tier instead of sharing one model:
+# - "creative": brand-strategy writing, where some variety is wanted
+# - "fast":     templated / list-style tools, deterministic and cacheable
+# - "json":     deterministic extraction; the schema is enforced per call
+#               by with_structured_output, so no response_format here
+# - "kit":      creative settings in JSON mode, for the one-call brand kit
+#               (a RunnableBinding, not a bare ChatOpenAI)
+def _model_tiers(http_async_client: Any = None) -> Dict[str, Any]:
+    load_env()
+    creative = _chat_model(0.35, http_async_client)
+    return {
+        "creative": creative,
+        "fast": _chat_model(0, http_async_client),
+        "json": _chat_model(0, http_async_client),
+        "kit": creative.bind(response_format={"type": "json_object"}),
+    }
+
+
+# Sync tiers are built once, on first use, and share the HTTP pool above.
+@functools.lru_cache(maxsize=None)
+def _llm_pool() -> Dict[str, Any]:
+    return _model_tiers()
+
+
+def _get_llm(tier: str = "creative") -> "ChatModel":
+    return _llm_pool()[tier]
+
+
+# An httpx.AsyncClient is bound to the event loop it first ran on, and every
+# asyncio.run() call starts a fresh one; so async calls share a client (plus
+# the tiers built on it) per running loop. Every async model call, and every
+# generate_all_tools / generate_client_kits run, holds it while active, and
+# the last holder closes it: its pooled connections would otherwise keep the
+# finished loop, and so this entry, alive.
+_LOOP_CLIENTS = weakref.WeakKeyDictionary()
+
+
+@contextlib.asynccontextmanager
+async def _loop_llms() -> AsyncIterator[Dict[str, Any]]:
+    """Async twin of _llm_pool: tiers wired to this loop's HTTP client."""
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    clients = _LOOP_CLIENTS.get(loop)
+    if clients is None:
+        http_async_client = httpx.AsyncClient(**_http_settings())
+        clients = _LOOP_CLIENTS[loop] = {
+            "http": http_async_client,
+            "llms": _model_tiers(http_async_client),
+            "holders": 0,
+        }
+    clients["holders"] += 1
+    try:
+        yield clients["llms"]
+    finally:
+        clients["holders"] -= 1
+        if clients["holders"] == 0:
+            if _LOOP_CLIENTS.get(loop) is clients:
+                del _LOOP_CLIENTS[loop]
+            await clients["http"].aclose()
+
+
+# --------------------------------------------------------------------
+# EXACT-MATCH RESPONSE CACHE
+# --------------------------------------------------------------------
+# Seconds a cached response stays valid
+RESPONSE_CACHE_TTL = 1800
+
+# Only near-deterministic calls are cached: at higher temperatures a
+# "regenerate" is expected to give a fresh answer, not a replay.
+CACHE_MAX_TEMPERATURE = 0.2
+
+# Upper bound on cached responses (least recently used dropped first)
+RESPONSE_CACHE_MAX_ENTRIES = 512
+
+# sha256 key -> (stored_at, content). The TTLCache bounds size and drops
+# entries after RESPONSE_CACHE_TTL; stored_at serves callers asking for a
+# shorter ttl. Streamlit sessions call in from separate threads, hence the lock.
+_RESP_CACHE: "TTLCache[str, Tuple[float, str]]" = TTLCache(
+    maxsize=RESPONSE_CACHE_MAX_ENTRIES, ttl=RESPONSE_CACHE_TTL
 )
+_RESP_CACHE_LOCK = threading.Lock()
+
+
+def _cache_key(chat: "ChatModel", system_prompt: str, user_prompt: str) -> str:
+    raw = f"{chat.model_name}|{chat.temperature}|{system_prompt}|{user_prompt}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+# System content is either one prompt or several blocks sent in a fixed order
+SystemPrompt = Union[str, Sequence[str]]
+
 
+def _system_blocks(system_prompt: SystemPrompt) -> List[str]:
+    if isinstance(system_prompt, str):
+        return [system_prompt]
+    return list(system_prompt)
 
-def _run_llm(system_prompt: str, user_prompt: str) -> str:
-    """Helper to call the chat model."""
-    messages = [
-        SystemMessage(content=system_prompt),
+
+def _build_messages(system_prompt: SystemPrompt, user_prompt: str) -> list:
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    return [
+        *(SystemMessage(content=block) for block in _system_blocks(system_prompt)),
         HumanMessage(content=user_prompt),
     ]
-    response = llm.invoke(messages)
+
+
+def _is_cacheable(chat: "ChatModel") -> bool:
+    return chat.temperature is not None and chat.temperature <= CACHE_MAX_TEMPERATURE
+
+
+def _cache_get(key: str, ttl: float) -> Optional[str]:
+    with _RESP_CACHE_LOCK:
+        hit = _RESP_CACHE.get(key)
+        if hit is None:
+            return None
+        stored_at, content = hit
+        if time.time() - stored_at >= ttl:
+            _RESP_CACHE.pop(key, None)
+            return None
+    return content
+
+
+def _cache_put(key: str, content: str) -> None:
+    with _RESP_CACHE_LOCK:
+        _RESP_CACHE[key] = (time.time(), content)
+
+
+def _cached_lookup(
+    chat: "ChatModel",
+    system_prompt: SystemPrompt,
+    user_prompt: str,
+    ttl: float = RESPONSE_CACHE_TTL,
+    tool: str = "",
+    cache: Optional[bool] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Response-cache step shared by every model call; returns (key, content).
+    key is None when the call isn't cached (nothing to store afterwards);
+    content is None on a miss. cache=True/False overrides _is_cacheable.
+    """
+    if cache is None:
+        cache = _is_cacheable(chat)
+    if not cache:
+        return None, None
+    key = _cache_key(chat, "|".join(_system_blocks(system_prompt)), user_prompt)
+    content = _cache_get(key, ttl)
+    if content is not None:
+        _log_cache_hit(tool)
+    return key, content
+
+
+# --------------------------------------------------------------------
+# CALL METRICS
+# --------------------------------------------------------------------
+# Every model call logs one "llm_call" record (token usage, OpenAI prompt-cache
+# reads, latency) so the caching layers can be tuned on real numbers.
+# generate_all_tools also installs a per-run aggregator and logs the totals.
+_USAGE_TOTALS: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar(
+    "llm_usage_totals", default=None
+)
+
+
+def _new_usage_totals() -> Dict[str, int]:
+    return {
+        "calls": 0,
+        "response_cache_hits": 0,
+        "in_tokens": 0,
+        "cached": 0,
+        "out_tokens": 0,
+        "latency_ms": 0,
+    }
+
+
+def _log_llm_call(tool: str, usage: Optional[Dict[str, Any]], started: float) -> None:
+    usage = usage or {}
+    record = {
+        "tool": tool,
+        "in_tokens": usage.get("input_tokens", 0),
+        "cached": (usage.get("input_token_details") or {}).get("cache_read", 0),
+        "out_tokens": usage.get("output_tokens", 0),
+        "latency_ms": int((time.perf_counter() - started) * 1000),
+    }
+    # Values go in the message too, so a plain formatter still shows them
+    logger.info("llm_call %s", record, extra=record)
+
+    totals = _USAGE_TOTALS.get()
+    if totals is not None:
+        totals["calls"] += 1
+        for field in ("in_tokens", "cached", "out_tokens", "latency_ms"):
+            totals[field] += record[field]
+
+
+def _log_cache_hit(tool: str) -> None:
+    logger.debug("llm_cache_hit %s", tool, extra={"tool": tool})
+    totals = _USAGE_TOTALS.get()
+    if totals is not None:
+        totals["response_cache_hits"] += 1
+
+
+def _run_llm(
+    system_prompt: SystemPrompt,
+    user_prompt: str,
+    tier: str = "creative",
+    ttl: float = RESPONSE_CACHE_TTL,
+    cache: Optional[bool] = None,
+    tool: str = "",
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Helper to call the chat model; returns (content, usage_metadata).
+    usage_metadata is None when the answer came from the response cache.
+    Low-temperature calls go through the response cache; pass cache=True/False
+    to override that default.
+    """
+    chat = _get_llm(tier)
+    key, cached = _cached_lookup(chat, system_prompt, user_prompt, ttl, tool, cache)
+    if cached is not None:
+        return cached, None
+
+    messages = _build_messages(system_prompt, user_prompt)
+    started = time.perf_counter()
+    response = chat.invoke(messages)
+    _log_llm_call(tool, response.usage_metadata, started)
+
+    if key:
+        _cache_put(key, response.content)
+    return response.content, response.usage_metadata
+
+
+def _run_llm_text(*args: Any, **kwargs: Any) -> str:
+    """_run_llm for callers that only want the text."""
+    return _run_llm(*args, **kwargs)[0]
+
+
+def _run_llm_stream(
+    system_prompt: SystemPrompt,
+    user_prompt: str,
+    tier: str = "creative",
+    ttl: float = RESPONSE_CACHE_TTL,
+    cache: Optional[bool] = None,
+    tool: str = "",
+) -> Iterator[str]:
+    """Streaming twin of _run_llm: yields text chunks as they arrive."""
+    chat = _get_llm(tier)
+    key, cached = _cached_lookup(chat, system_prompt, user_prompt, ttl, tool, cache)
+    if cached is not None:
+        yield cached
+        return
+
+    parts: List[str] = []
+    usage = None
+    started = time.perf_counter()
+    for chunk in chat.stream(_build_messages(system_prompt, user_prompt)):
+        if chunk.usage_metadata:
+            usage = chunk.usage_metadata
+        if chunk.content:
+            parts.append(chunk.content)
+            yield chunk.content
+    _log_llm_call(tool, usage, started)
+
+    if key:
+        _cache_put(key, "".join(parts))
+
+
+# Cap on in-flight async LLM calls (keeps parallel fan-out under OpenAI RPM limits)
+MAX_CONCURRENT_LLM_CALLS = 8
+
+# One semaphore per event loop: asyncio primitives can't be shared across loops,
+# and every asyncio.run() call starts a fresh one.
+_LLM_SEMAPHORES = weakref.WeakKeyDictionary()
+
+
+def _llm_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _LLM_SEMAPHORES.get(loop)
+    if sem is None:
+        sem = _LLM_SEMAPHORES[loop] = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+    return sem
+
+
+async def _arun_llm(
+    system_prompt: SystemPrompt,
+    user_prompt: str,
+    tier: str = "creative",
+    ttl: float = RESPONSE_CACHE_TTL,
+    cache: Optional[bool] = None,
+    tool: str = "",
+) -> str:
+    """Async helper to call the chat model (bounded by MAX_CONCURRENT_LLM_CALLS)."""
+    key, cached = _cached_lookup(_get_llm(tier), system_prompt, user_prompt, ttl, tool, cache)
+    if cached is not None:
+        return cached
+
+    messages = _build_messages(system_prompt, user_prompt)
+    async with _loop_llms() as llms, _llm_semaphore():
+        started = time.perf_counter()
+        response = await llms[tier].ainvoke(messages)
+    _log_llm_call(tool, response.usage_metadata, started)
+
+    if key:
+        _cache_put(key, response.content)
     return response.content
 
 
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+def _structured_result(tool: str, out: Dict[str, Any], started: float) -> Any:
+    """Log usage from an include_raw structured call and return the parsed model."""
+    _log_llm_call(tool, out["raw"].usage_metadata, started)
+    if out.get("parsing_error") is not None:
+        raise out["parsing_error"]
+    return out["parsed"]
+
+
+def _run_structured(
+    system_prompt: SystemPrompt,
+    user_prompt: str,
+    schema: Type[SchemaT],
+    tier: str = "creative",
+    ttl: float = RESPONSE_CACHE_TTL,
+    tool: str = "",
+) -> SchemaT:
+    """Call the chat model with a strict JSON schema and return the parsed model."""
+    chat = _get_llm(tier)
+    key, cached = _cached_lookup(
+        chat, system_prompt, f"{schema.__name__}|{user_prompt}", ttl, tool
+    )
+    if cached is not None:
+        return schema.model_validate_json(cached)
+
+    messages = _build_messages(system_prompt, user_prompt)
+    started = time.perf_counter()
+    out = chat.with_structured_output(schema, include_raw=True).invoke(messages)
+    result = _structured_result(tool, out, started)
+
+    if key:
+        _cache_put(key, result.model_dump_json())
+    return result
+
+
+async def _arun_structured(
+    system_prompt: SystemPrompt,
+    user_prompt: str,
+    schema: Type[SchemaT],
+    tier: str = "creative",
+    ttl: float = RESPONSE_CACHE_TTL,
+    tool: str = "",
+) -> SchemaT:
+    key, cached = _cached_lookup(
+        _get_llm(tier), system_prompt, f"{schema.__name__}|{user_prompt}", ttl, tool
+    )
+    if cached is not None:
+        return schema.model_validate_json(cached)
+
+    messages = _build_messages(system_prompt, user_prompt)
+    async with _loop_llms() as llms, _llm_semaphore():
+        started = time.perf_counter()
+        structured = llms[tier].with_structured_output(schema, include_raw=True)
+        out = await structured.ainvoke(messages)
+    result = _structured_result(tool, out, started)
+
+    if key:
+        _cache_put(key, result.model_dump_json())
+    return result
+
+
+# --------------------------------------------------------------------
+# STRUCTURED OUTPUT SCHEMAS
+# --------------------------------------------------------------------
+class BriefFields(BaseModel):
+    """Intake fields pulled out of a free-form brief ("" when unknown)."""
+
+    client_name: str
+    industry: str
+    target_audience: str
+    goals: str
+    brand_vibe: str
+    voice_tone: str
+    colors: str
+    visual_keywords: str
+    platforms: str
+    reference_links: str
+
+
+class CalendarEntry(BaseModel):
+    day: int
+    platform: str
+    post_type: str
+    hook: str
+    visual_direction: str
+    cta: str
+
+
+class ContentCalendar(BaseModel):
+    entries: List[CalendarEntry]
+
+
+def _calendar_json(entries: List[Any]) -> str:
+    """Serialize calendar entries as the JSON list the UI renders."""
+    return json.dumps(
+        [e.model_dump() if isinstance(e, BaseModel) else e for e in entries]
+    )
+
+
+# Context layout. Order is fixed so identical filled-in fields always produce
+# an identical block (keeps the shared prompt prefix cacheable).
+_CONTEXT_SECTIONS = (
+    ("Client / Brand:", (("Name", "client_name"), ("Industry / niche", "industry"))),
+    (
+        "Audience & Goals:",
+        (("Target audience", "target_audience"), ("Main business / brand goals", "goals")),
+    ),
+    (
+        "Brand Vibe & Personality:",
+        (("Current / desired vibe", "brand_vibe"), ("Voice & tone notes", "voice_tone")),
+    ),
+    (
+        "Visual Direction:",
+        (("Preferred colors or themes", "colors"), ("Visual keywords / mood", "visual_keywords")),
+    ),
+    ("Platforms:", (("Main platforms", "platforms"),)),
+)
+
+# Fields echoed under a raw brief
+_BRIEF_INTAKE_FIELDS = (
+    ("Client / Brand", "client_name"),
+    ("Industry / niche", "industry"),
+    ("Target audience", "target_audience"),
+    ("Main goals", "goals"),
+    ("Brand vibe", "brand_vibe"),
+    ("Voice & tone", "voice_tone"),
+    ("Preferred colors", "colors"),
+    ("Visual keywords / mood", "visual_keywords"),
+    ("Main platforms", "platforms"),
+)
+
+
+def _answer(answers: Dict[str, Any], key: str) -> str:
+    value = answers.get(key)
+    return value.strip() if isinstance(value, str) else ""
+
+
 def _build_context_text(answers: Dict[str, Any]) -> str:
     """Turn the UI answers into a clean context block for prompts."""
+    # Memoized on a stable serialization, so running many tools for the same
+    # answers builds the block once.
+    return _build_context_cached(json.dumps(answers, sort_keys=True, default=str))
+
+
+@functools.lru_cache(maxsize=32)
+def _build_context_cached(answers_json: str) -> str:
+    return _truncate_context(_assemble_context(json.loads(answers_json)))
 
+
+# Hard cap on context size: huge pasted briefs otherwise mean slow TTFT and
+# cut-off replies on every tool call.
+MAX_CONTEXT_TOKENS = 4000
+MAX_CONTEXT_FILES = 50
+MAX_FILENAME_CHARS = 80
+
+
+# Rough chars-per-token, used only if the tiktoken BPE file can't be loaded
+# (it's downloaded on first use)
+_CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=None)
+def _token_encoder():
+    try:
+        import tiktoken
+
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception:
+        return None
+
+
+def _truncate_context(context: str) -> str:
+    enc = _token_encoder()
+    if enc is None:
+        max_chars = MAX_CONTEXT_TOKENS * _CHARS_PER_TOKEN
+        if len(context) <= max_chars:
+            return context
+        return context[:max_chars] + "…[truncated]"
+
+    tokens = enc.encode(context)
+    if len(tokens) <= MAX_CONTEXT_TOKENS:
+        return context
+    return enc.decode(tokens[:MAX_CONTEXT_TOKENS]) + "…[truncated]"
+
+
+def _upload_name(entry: Any) -> str:
+    # uploaded_files entries are {"name", "size"} metadata dicts (plain
+    # filename strings are still accepted); only the name reaches the model,
+    # clipped so a runaway filename can't bloat every prompt
+    name = str(entry.get("name", "")) if isinstance(entry, dict) else str(entry)
+    if len(name) > MAX_FILENAME_CHARS:
+        name = name[: MAX_FILENAME_CHARS - 1] + "…"
+    return name
+
+
+def _assemble_context(answers: Dict[str, Any]) -> str:
     # 1) If user pasted a raw brief, use that directly.
-    raw_brief = answers.get("raw_brief", "")
-    if isinstance(raw_brief, str) and raw_brief.strip():
-        return f"""RAW CLIENT BRIEF (user-typed):
-
-{raw_brief.strip()}
-
-------------------------------
-Structured intake fields (if any were filled):
-Client / Brand: {answers.get("client_name") or "N/A"}
-Industry / niche: {answers.get("industry") or "N/A"}
-Target audience: {answers.get("target_audience") or "N/A"}
-Main goals: {answers.get("goals") or "N/A"}
-Brand vibe: {answers.get("brand_vibe") or "N/A"}
-Voice & tone: {answers.get("voice_tone") or "N/A"}
-Preferred colors: {answers.get("colors") or "N/A"}
-Visual keywords / mood: {answers.get("visual_keywords") or "N/A"}
-Main platforms: {answers.get("platforms") or "N/A"}
-"""
-
-    # 2) Otherwise, fall back to structured fields
-
-    raw_refs = answers.get("reference_links", "")
-    if isinstance(raw_refs, str):
-        refs_text = raw_refs.strip()
-    else:
-        refs_text = ""
+    raw_brief = _answer(answers, "raw_brief")
+    if raw_brief:
+        intake_lines = [
+            f"{label}: {value}"
+            for label, key in _BRIEF_INTAKE_FIELDS
+            if (value := _answer(answers, key))
+        ]
+        context = f"RAW CLIENT BRIEF (user-typed):\n\n{raw_brief}"
+        if intake_lines:
+            context += (
+                "\n\n------------------------------\n"
+                "Structured intake fields:\n" + "\n".join(intake_lines)
+            )
+        return context
+
+    # 2) Otherwise, fall back to structured fields.
+    # Only filled-in sections are sent; empty ones would just be paid-for
+    # "N/A" tokens on every tool call.
+    sections = []
+    for header, fields in _CONTEXT_SECTIONS:
+        lines = [
+            f"- {label}: {value}"
+            for label, key in fields
+            if (value := _answer(answers, key))
+        ]
+        if lines:
+            sections.append(header + "\n" + "\n".join(lines))
+
+    refs_text = _answer(answers, "reference_links")
+    if refs_text:
+        sections.append(
+            "References:\n- Reference links (Insta, Pinterest, sites):\n" + refs_text
+        )
 
     uploaded_files = answers.get("uploaded_files", [])
     uploaded_files = uploaded_files or []
 
-    files_text = ""
     if isinstance(uploaded_files, (list, tuple)) and uploaded_files:
-        files_text = "Uploaded reference files (filenames only, designer will open locally):\n"
-        for name in uploaded_files:
-            files_text += f"- {name}\n"
+        files_text = (
+            "Uploaded reference files (filenames only, designer will open locally):\n"
+            + "\n".join(
+                f"- {_upload_name(entry)}" for entry in uploaded_files[:MAX_CONTEXT_FILES]
+            )
+        )
+        if len(uploaded_files) > MAX_CONTEXT_FILES:
+            files_text += f"\n- (+{len(uploaded_files) - MAX_CONTEXT_FILES} more)"
+        sections.append(files_text)
+
+    return "\n\n".join(filter(None, sections))
+
+
+def _resolve_context(answers: Dict[str, Any], context: Optional[str]) -> str:
+    """Use a pre-built context block if the caller has one, else build it."""
+    if context is None:
+        context = _build_context_text(answers)
+    return context
+
+
+# --------------------------------------------------------------------
+# SHARED PROMPT PREFIX
+# --------------------------------------------------------------------
+# Every tool sends: preamble -> client context -> tool prompt, in that order.
+# The first two blocks are identical for all tools run for the same client, so
+# OpenAI's automatic prompt caching can reuse that prefix across regenerations
+# and across tools. Keep them byte-stable (no timestamps, no per-tool text).
+SHARED_PREAMBLE = """
+You are part of Tru Designs' brand toolkit: a set of studio tools that turn
+client intake notes into practical creative deliverables for designers.
+
+The next message holds the client context. The message after it describes
+the specific deliverable to produce. Base your work on that client context.
+""".strip()
 
-    context = f"""
-Client / Brand:
-- Name: {answers.get("client_name") or "N/A"}
-- Industry / niche: {answers.get("industry") or "N/A"}
 
-Audience & Goals:
-- Target audience: {answers.get("target_audience") or "N/A"}
-- Main business / brand goals: {answers.get("goals") or "N/A"}
+def _context_block(context: str) -> str:
+    return f"CLIENT CONTEXT:\n{context}"
 
-Brand Vibe & Personality:
-- Current / desired vibe: {answers.get("brand_vibe") or "N/A"}
-- Voice & tone notes: {answers.get("voice_tone") or "N/A"}
 
-Visual Direction:
-- Preferred colors or themes: {answers.get("colors") or "N/A"}
-- Visual keywords / mood: {answers.get("visual_keywords") or "N/A"}
+def _tool_request(
+    context: str, tool_prompt: str, tool_name: str
+) -> Tuple[List[str], str]:
+    """Return (system blocks, user prompt) for a context-driven tool."""
+    system_blocks = [SHARED_PREAMBLE, _context_block(context), tool_prompt]
+    return system_blocks, f"Produce the {tool_name} now."
 
-Platforms:
-- Main platforms: {answers.get("platforms") or "N/A"}
 
-References:
-- Reference links (Insta, Pinterest, sites):
-{refs_text or "None provided."}
+def _spec_request(tool: str, context: str) -> Tuple[List[str], str]:
+    tool_name, tool_prompt, _ = _TOOL_SPECS[tool]
+    return _tool_request(context, tool_prompt, tool_name)
 
-{files_text or ""}
-"""
-    return context.strip()
+
+def _tool_tier(tool: str) -> str:
+    return _TOOL_SPECS[tool][2]
 
 
 # --------------------------------------------------------------------
-# 1) Brand Discovery Summary
+# SEMANTIC RESPONSE CACHE (near-duplicate briefs)
 # --------------------------------------------------------------------
-def generate_brand_discovery_summary(answers: Dict[str, Any]) -> str:
-    context = _build_context_text(answers)
+# Two clients with nearly identical intakes (e.g. two coffee shops that differ
+# only by name) miss the exact-match cache. For structural, low-temperature
+# tools we also look up the closest earlier context by embedding and reuse its
+# answer with the client name swapped in. Never used for creative tools.
+SEMANTIC_CACHE_TOOLS = {"invoice_outline", "site_outline"}
+SEMANTIC_CACHE_MIN_SIMILARITY = 0.95
+SEMANTIC_CACHE_MAX_ENTRIES = 256  # per tool, oldest dropped first
+
+
+# Embeddings are only fetched from the sync cache step below (async drivers
+# run it on a worker thread), so there is no per-loop async client here.
+@functools.lru_cache(maxsize=None)
+def _get_embeddings() -> "OpenAIEmbeddings":
+    from langchain_openai import OpenAIEmbeddings
+
+    load_env()
+    return OpenAIEmbeddings(
+        model="text-embedding-3-small",
+        max_retries=LLM_MAX_RETRIES,
+        http_client=_http_client(),
+    )
+
+
+# tool -> [(stored_at, unit-length embedding, client name, response)]
+_SEM_CACHE: Dict[str, List[Tuple[float, "np.ndarray", str, str]]] = {}
+_SEM_CACHE_LOCK = threading.Lock()  # same reason as _RESP_CACHE_LOCK
+
+
+def _semantic_eligible(tool: str) -> bool:
+    return tool in SEMANTIC_CACHE_TOOLS and _is_cacheable(_get_llm(_tool_tier(tool)))
+
+
+def _semantic_text(tool: str, context: str) -> str:
+    return f"{context}|{tool}"
+
+
+def _unit(vector: List[float]) -> "np.ndarray":
+    import numpy as np
+
+    v = np.asarray(vector, dtype=np.float32)
+    return v / (np.linalg.norm(v) or 1.0)
+
+
+def _semantic_lookup(
+    tool: str, vec: "np.ndarray", client_name: str, ttl: float = RESPONSE_CACHE_TTL
+) -> Optional[str]:
+    now = time.time()
+    with _SEM_CACHE_LOCK:
+        entries = [e for e in _SEM_CACHE.get(tool, []) if now - e[0] < ttl]
+        _SEM_CACHE[tool] = entries  # drop expired answers
+    if not entries:
+        return None
+
+    import numpy as np
+
+    sims = np.stack([e[1] for e in entries]) @ vec
+    best = int(np.argmax(sims))
+    if sims[best] < SEMANTIC_CACHE_MIN_SIMILARITY:
+        return None
+    _, _, cached_name, response = entries[best]
+    if cached_name and client_name and cached_name != client_name:
+        # Whole words only: "Bean" -> "Brew" must leave "Beanery" alone. Lookarounds
+        # rather than \b so names ending in punctuation ("Acme Co.") still match.
+        response = re.sub(
+            rf"(?<!\w){re.escape(cached_name)}(?!\w)", lambda _: client_name, response
+        )
+    return response
 
-    system_prompt = """
+
+def _semantic_store(tool: str, vec: "np.ndarray", client_name: str, response: str) -> None:
+    with _SEM_CACHE_LOCK:
+        entries = _SEM_CACHE.setdefault(tool, [])
+        entries.append((time.time(), vec, client_name, response))
+        if len(entries) > SEMANTIC_CACHE_MAX_ENTRIES:
+            del entries[0]
+
+
+def _semantic_vector(tool: str, context: str) -> Optional["np.ndarray"]:
+    """Embedding for a semantic-cache lookup, or None if the tool isn't eligible."""
+    if not _semantic_eligible(tool):
+        return None
+    try:
+        return _unit(_get_embeddings().embed_query(_semantic_text(tool, context)))
+    except Exception:
+        # The cache is an optimization; fall through to a normal call
+        return None
+
+
+class _ToolCache(NamedTuple):
+    """Outcome of the cache step that runs before a tool's model call."""
+
+    hit: Optional[str]  # cached answer, if any
+    key: Optional[str]  # response-cache key to store under (None: not cached)
+    vec: Optional["np.ndarray"]  # semantic-cache embedding (None: not eligible)
+
+
+def _tool_cache_lookup(tool: str, context: str, client_name: str) -> _ToolCache:
+    """
+    Exact-match cache first; only on a miss, and only for semantic-cache tools,
+    embed the context and look for a near-duplicate answer.
+    """
+    key, hit = _cached_lookup(
+        _get_llm(_tool_tier(tool)), *_spec_request(tool, context), tool=tool
+    )
+    if hit is not None:
+        return _ToolCache(hit, key, None)
+    vec = _semantic_vector(tool, context)
+    if vec is not None:
+        hit = _semantic_lookup(tool, vec, client_name)
+    return _ToolCache(hit, key, vec)
+
+
+def _tool_cache_store(tool: str, entry: _ToolCache, client_name: str, result: str) -> None:
+    if entry.key:
+        _cache_put(entry.key, result)
+    if entry.vec is not None:
+        _semantic_store(tool, entry.vec, client_name, result)
+
+
+def _generate(tool: str, answers: Dict[str, Any], context: Optional[str]) -> str:
+    """Run one tool from _TOOL_SPECS (or read it out of the batched kit)."""
+    context = _resolve_context(answers, context)
+    if USE_BATCHED_KIT:
+        return generate_full_brand_kit(answers, context)[tool]
+
+    client_name = _answer(answers, "client_name")
+    entry = _tool_cache_lookup(tool, context, client_name)
+    if entry.hit is not None:
+        return entry.hit
+
+    result = _run_llm_text(
+        *_spec_request(tool, context), tier=_tool_tier(tool), cache=False, tool=tool
+    )
+    _tool_cache_store(tool, entry, client_name, result)
+    return result
+
+
+def _generate_stream(
+    tool: str, answers: Dict[str, Any], context: Optional[str]
+) -> Iterator[str]:
+    context = _resolve_context(answers, context)
+    if USE_BATCHED_KIT:
+        yield generate_full_brand_kit(answers, context)[tool]
+        return
+
+    client_name = _answer(answers, "client_name")
+    entry = _tool_cache_lookup(tool, context, client_name)
+    if entry.hit is not None:
+        yield entry.hit
+        return
+
+    parts: List[str] = []
+    for chunk in _run_llm_stream(
+        *_spec_request(tool, context), tier=_tool_tier(tool), cache=False, tool=tool
+    ):
+        parts.append(chunk)
+        yield chunk
+    _tool_cache_store(tool, entry, client_name, "".join(parts))
+
+
+async def _agenerate(
+    tool: str, answers: Dict[str, Any], context: Optional[str]
+) -> str:
+    context = _resolve_context(answers, context)
+
+    client_name = _answer(answers, "client_name")
+    # The lookup may embed the context (a blocking call), so keep it off the loop
+    entry = await asyncio.to_thread(_tool_cache_lookup, tool, context, client_name)
+    if entry.hit is not None:
+        return entry.hit
+
+    result = await _arun_llm(
+        *_spec_request(tool, context), tier=_tool_tier(tool), cache=False, tool=tool
+    )
+    _tool_cache_store(tool, entry, client_name, result)
+    return result
+
+
+# --------------------------------------------------------------------
+# 1) Brand Discovery Summary
+# --------------------------------------------------------------------
+SYS_DISCOVERY = """
 You are a senior brand strategist and creative director.
 You turn messy client intake notes into a clear, friendly brand discovery summary.
 
@@ -120,10 +905,8 @@ Write in a way that:
 - Highlights what you *do* know and what follow-up questions you would ask.
 
 Do NOT invent fake data like revenue or follower counts.
-    """.strip()
 
-    user_prompt = f"""
-Based on the following intake notes, write a Brand Discovery Summary.
+Based on the client context above, write a Brand Discovery Summary.
 
 Focus on:
 1) Who this brand is.
@@ -132,21 +915,31 @@ Focus on:
 4) Brand personality.
 5) Visual direction.
 6) Top 5–7 opportunities or recommendations.
-
-INTAKE NOTES:
-{context}
 """.strip()
 
-    return _run_llm(system_prompt, user_prompt)
+
+def generate_brand_discovery_summary(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return _generate("brand_discovery", answers, context)
+
+
+def generate_brand_discovery_summary_stream(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> Iterator[str]:
+    return _generate_stream("brand_discovery", answers, context)
+
+
+async def agenerate_brand_discovery_summary(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return await _agenerate("brand_discovery", answers, context)
 
 
 # --------------------------------------------------------------------
 # 2) Brand Style Guide
 # --------------------------------------------------------------------
-def generate_brand_style_guide(answers: Dict[str, Any]) -> str:
-    context = _build_context_text(answers)
-
-    system_prompt = """
+SYS_STYLE_GUIDE = """
 You are a brand designer and art director.
 
 Create a *lite* but practical brand style guide that a designer could use
@@ -165,25 +958,33 @@ The guide should have clearly titled sections like:
 
 Keep it concise but specific. Use markdown headings and bullet lists.
 If information is missing, make reasonable suggestions and note them as suggestions.
-    """.strip()
 
-    user_prompt = f"""
-Using the following context, create a brand style guide document.
-
-CONTEXT:
-{context}
+Using the client context above, create a brand style guide document.
 """.strip()
 
-    return _run_llm(system_prompt, user_prompt)
+
+def generate_brand_style_guide(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return _generate("style_guide", answers, context)
+
+
+def generate_brand_style_guide_stream(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> Iterator[str]:
+    return _generate_stream("style_guide", answers, context)
+
+
+async def agenerate_brand_style_guide(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return await _agenerate("style_guide", answers, context)
 
 
 # --------------------------------------------------------------------
 # 3) 30-Day Content Calendar (JSON)
 # --------------------------------------------------------------------
-def generate_content_calendar(answers: Dict[str, Any]) -> str:
-    context = _build_context_text(answers)
-
-    system_prompt = """
+SYS_CONTENT_CALENDAR = """
 You are a social media strategist for a creative agency.
 
 Create a 30-day content calendar that:
@@ -192,8 +993,8 @@ Create a 30-day content calendar that:
 
 IMPORTANT:
 - Return the result as pure JSON ONLY.
-- The JSON must be a list of 30 objects.
-- Each object must have exactly these keys:
+- The JSON must be an object with one key, "entries": a list of 30 objects.
+- Each entry must have exactly these keys:
   "day" (int),
   "platform" (string),
   "post_type" (string),
@@ -203,25 +1004,48 @@ IMPORTANT:
 
 Do NOT include any extra text before or after the JSON.
 Do NOT format it as markdown.
-    """.strip()
-
-    user_prompt = f"""
-Based on this brand context, generate a 30-day content calendar.
 
-CONTEXT:
-{context}
+Based on the brand context above, generate a 30-day content calendar.
 """.strip()
 
-    return _run_llm(system_prompt, user_prompt)
+
+def generate_content_calendar(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    """Returns the calendar as a JSON list of entries (schema-enforced)."""
+    context = _resolve_context(answers, context)
+    if USE_BATCHED_KIT:
+        return generate_full_brand_kit(answers, context)["content_calendar"]
+    calendar = _run_structured(
+        *_spec_request("content_calendar", context),
+        ContentCalendar,
+        tier=_tool_tier("content_calendar"),
+        tool="content_calendar",
+    )
+    return _calendar_json(calendar.entries)
+
+
+# No _stream variant: callers need the whole calendar (the UI shows it as a table),
+# and the schema-enforced call above is the one that cannot return invalid JSON.
+
+
+async def agenerate_content_calendar(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    context = _resolve_context(answers, context)
+    calendar = await _arun_structured(
+        *_spec_request("content_calendar", context),
+        ContentCalendar,
+        tier=_tool_tier("content_calendar"),
+        tool="content_calendar",
+    )
+    return _calendar_json(calendar.entries)
 
 
 # --------------------------------------------------------------------
 # 4) Logo Direction Ideas
 # --------------------------------------------------------------------
-def generate_logo_directions(answers: Dict[str, Any]) -> str:
-    context = _build_context_text(answers)
-
-    system_prompt = """
+SYS_LOGO_DIRECTIONS = """
 You are a senior logo designer and creative director.
 
 Create CONCEPT directions for a logo, NOT final artwork.
@@ -241,25 +1065,33 @@ Your output should include:
 
 Write in markdown with headings and bullet points.
 Make sure the directions are specific enough that a designer could sketch from them.
-    """.strip()
-
-    user_prompt = f"""
-Using the following brand intake notes, create logo concept directions.
 
-CONTEXT:
-{context}
+Using the client context above, create logo concept directions.
 """.strip()
 
-    return _run_llm(system_prompt, user_prompt)
+
+def generate_logo_directions(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return _generate("logo_directions", answers, context)
+
+
+def generate_logo_directions_stream(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> Iterator[str]:
+    return _generate_stream("logo_directions", answers, context)
+
+
+async def agenerate_logo_directions(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return await _agenerate("logo_directions", answers, context)
 
 
 # --------------------------------------------------------------------
 # 5) AI Logo Sketch Kit (concepts + AI prompts)
 # --------------------------------------------------------------------
-def generate_logo_sketch_kit(answers: Dict[str, Any]) -> str:
-    context = _build_context_text(answers)
-
-    system_prompt = """
+SYS_LOGO_SKETCH_KIT = """
 You are a logo designer who also knows how to write prompts for AI image tools.
 
 Create a "Logo Sketch Kit" that includes:
@@ -274,25 +1106,33 @@ Create a "Logo Sketch Kit" that includes:
    - Suggestions for simple vector shapes that could work well (e.g., thick circle badge, angled rectangle, etc.)
 
 Write in markdown with headings and bullet points.
-    """.strip()
-
-    user_prompt = f"""
-Using this brand context, create a Logo Sketch Kit.
 
-CONTEXT:
-{context}
+Using the brand context above, create a Logo Sketch Kit.
 """.strip()
 
-    return _run_llm(system_prompt, user_prompt)
+
+def generate_logo_sketch_kit(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return _generate("logo_sketch_kit", answers, context)
+
+
+def generate_logo_sketch_kit_stream(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> Iterator[str]:
+    return _generate_stream("logo_sketch_kit", answers, context)
+
+
+async def agenerate_logo_sketch_kit(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return await _agenerate("logo_sketch_kit", answers, context)
 
 
 # --------------------------------------------------------------------
 # 6) Website / Landing Page Outline
 # --------------------------------------------------------------------
-def generate_site_outline(answers: Dict[str, Any]) -> str:
-    context = _build_context_text(answers)
-
-    system_prompt = """
+SYS_SITE_OUTLINE = """
 You are a UX/UI designer and conversion-focused copywriter.
 
 Your job is to produce:
@@ -319,25 +1159,33 @@ Structure your answer as:
 
 Write in markdown with clear headings and bullet points.
 Make it something a designer could turn directly into a Figma wireframe.
-    """.strip()
-
-    user_prompt = f"""
-Based on this brand and project context, create a website / landing page outline.
 
-CONTEXT:
-{context}
+Based on the brand and project context above, create a website / landing page outline.
 """.strip()
 
-    return _run_llm(system_prompt, user_prompt)
+
+def generate_site_outline(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return _generate("site_outline", answers, context)
+
+
+def generate_site_outline_stream(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> Iterator[str]:
+    return _generate_stream("site_outline", answers, context)
+
+
+async def agenerate_site_outline(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return await _agenerate("site_outline", answers, context)
 
 
 # --------------------------------------------------------------------
 # 7) Project Summary & Simple Proposal
 # --------------------------------------------------------------------
-def generate_project_summary_proposal(answers: Dict[str, Any]) -> str:
-    context = _build_context_text(answers)
-
-    system_prompt = """
+SYS_PROJECT_PROPOSAL = """
 You are a freelance creative director writing a friendly but clear project summary and proposal.
 
 You are NOT writing a legal contract.
@@ -371,25 +1219,33 @@ Structure your answer as:
    - What you need from the client
 
 Write in markdown. Keep the tone warm, clear, and professional.
-    """.strip()
 
-    user_prompt = f"""
-Using these notes, create a project summary and simple proposal outline.
-
-CONTEXT:
-{context}
+Using the notes above, create a project summary and simple proposal outline.
 """.strip()
 
-    return _run_llm(system_prompt, user_prompt)
+
+def generate_project_summary_proposal(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return _generate("project_proposal", answers, context)
+
+
+def generate_project_summary_proposal_stream(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> Iterator[str]:
+    return _generate_stream("project_proposal", answers, context)
+
+
+async def agenerate_project_summary_proposal(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return await _agenerate("project_proposal", answers, context)
 
 
 # --------------------------------------------------------------------
 # 8) Color Palette Generator  (no JSON section)
 # --------------------------------------------------------------------
-def generate_color_palette(answers: Dict[str, Any]) -> str:
-    context = _build_context_text(answers)
-
-    system_prompt = """
+SYS_COLOR_PALETTE = """
 You are a brand designer and color specialist.
 
 Create a color system for this brand.
@@ -416,25 +1272,33 @@ Include:
 
 Keep everything consistent and ready to be copied into design tools.
 Do NOT include any JSON, code blocks, or a section called "Palette JSON".
-    """.strip()
 
-    user_prompt = f"""
-Based on this brand context, create a color palette system.
-
-CONTEXT:
-{context}
+Based on the brand context above, create a color palette system.
 """.strip()
 
-    return _run_llm(system_prompt, user_prompt)
+
+def generate_color_palette(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return _generate("color_palette", answers, context)
+
+
+def generate_color_palette_stream(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> Iterator[str]:
+    return _generate_stream("color_palette", answers, context)
+
+
+async def agenerate_color_palette(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return await _agenerate("color_palette", answers, context)
 
 
 # --------------------------------------------------------------------
 # 9) Brand Voice Generator
 # --------------------------------------------------------------------
-def generate_brand_voice(answers: Dict[str, Any]) -> str:
-    context = _build_context_text(answers)
-
-    system_prompt = """
+SYS_BRAND_VOICE = """
 You are a copy director creating a brand voice guide.
 
 Create:
@@ -451,25 +1315,33 @@ Create:
    - Optional: short "About" intro paragraph.
 
 Write in markdown. Keep it practical and easy for a junior writer to follow.
-    """.strip()
-
-    user_prompt = f"""
-Based on this brand intake, create a brand voice guide.
 
-CONTEXT:
-{context}
+Based on the brand intake above, create a brand voice guide.
 """.strip()
 
-    return _run_llm(system_prompt, user_prompt)
+
+def generate_brand_voice(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return _generate("brand_voice", answers, context)
+
+
+def generate_brand_voice_stream(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> Iterator[str]:
+    return _generate_stream("brand_voice", answers, context)
+
+
+async def agenerate_brand_voice(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return await _agenerate("brand_voice", answers, context)
 
 
 # --------------------------------------------------------------------
 # 10) Proposal → Invoice Outline
 # --------------------------------------------------------------------
-def generate_invoice_outline(answers: Dict[str, Any]) -> str:
-    context = _build_context_text(answers)
-
-    system_prompt = """
+SYS_INVOICE_OUTLINE = """
 You are a freelance designer turning a scope into an invoice-style outline.
 
 Create:
@@ -488,25 +1360,33 @@ Create:
    - e.g., deposit %, due dates, late fees, what is included/excluded.
 
 This is NOT a legal or tax document, just a structured outline a designer can paste into an invoicing tool.
-    """.strip()
-
-    user_prompt = f"""
-Using the project context below, create an invoice-style outline.
 
-CONTEXT:
-{context}
+Using the project context above, create an invoice-style outline.
 """.strip()
 
-    return _run_llm(system_prompt, user_prompt)
+
+def generate_invoice_outline(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return _generate("invoice_outline", answers, context)
+
+
+def generate_invoice_outline_stream(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> Iterator[str]:
+    return _generate_stream("invoice_outline", answers, context)
+
+
+async def agenerate_invoice_outline(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return await _agenerate("invoice_outline", answers, context)
 
 
 # --------------------------------------------------------------------
 # 11) Domain Name + Tagline Ideas
 # --------------------------------------------------------------------
-def generate_domain_and_taglines(answers: Dict[str, Any]) -> str:
-    context = _build_context_text(answers)
-
-    system_prompt = """
+SYS_DOMAIN_TAGLINES = """
 You are a naming and tagline specialist.
 
 Create:
@@ -522,73 +1402,252 @@ Create:
    - 10–20 short taglines that could appear under the logo or hero section.
 
 Keep the list scannable with bullets. Assume the client will check availability themselves.
-    """.strip()
-
-    user_prompt = f"""
-Based on this brand context, suggest domain names and taglines.
 
-CONTEXT:
-{context}
+Based on the brand context above, suggest domain names and taglines.
 """.strip()
 
-    return _run_llm(system_prompt, user_prompt)
+
+def generate_domain_and_taglines(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return _generate("domain_taglines", answers, context)
+
+
+def generate_domain_and_taglines_stream(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> Iterator[str]:
+    return _generate_stream("domain_taglines", answers, context)
+
+
+async def agenerate_domain_and_taglines(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> str:
+    return await _agenerate("domain_taglines", answers, context)
 
 
 # --------------------------------------------------------------------
-# 12) Auto-Fill from Brief: parse brief into fields
+# Tool registry
 # --------------------------------------------------------------------
-def parse_brief_to_fields(raw_brief: str) -> Dict[str, str]:
+# key -> (display name, tool prompt, model tier)
+_TOOL_SPECS = {
+    "brand_discovery": ("Brand Discovery Summary", SYS_DISCOVERY, "creative"),
+    "style_guide": ("Brand Style Guide", SYS_STYLE_GUIDE, "creative"),
+    "content_calendar": ("30-Day Content Calendar", SYS_CONTENT_CALENDAR, "creative"),
+    "logo_directions": ("Logo Concept Directions", SYS_LOGO_DIRECTIONS, "creative"),
+    "logo_sketch_kit": ("Logo Sketch Kit", SYS_LOGO_SKETCH_KIT, "creative"),
+    "site_outline": ("Website / Landing Page Outline", SYS_SITE_OUTLINE, "fast"),
+    "project_proposal": ("Project Summary & Proposal", SYS_PROJECT_PROPOSAL, "creative"),
+    "color_palette": ("Color Palette System", SYS_COLOR_PALETTE, "creative"),
+    "brand_voice": ("Brand Voice Guide", SYS_BRAND_VOICE, "creative"),
+    "invoice_outline": ("Invoice Outline", SYS_INVOICE_OUTLINE, "fast"),
+    "domain_taglines": ("Domain & Tagline Ideas", SYS_DOMAIN_TAGLINES, "fast"),
+}
+
+
+# --------------------------------------------------------------------
+# Full brand kit in ONE call (all sections in a single JSON envelope)
+# --------------------------------------------------------------------
+# When on, the single-tool generate_* functions read their section out of one
+# batched kit call (cached per client context) instead of each making a call.
+USE_BATCHED_KIT = os.getenv("TRU_BATCHED_KIT", "").lower() in ("1", "true", "yes")
+
+_KIT_KEYS = "\n".join(f'- "{key}": {spec[0]}' for key, spec in _TOOL_SPECS.items())
+_KIT_SECTIONS = "\n\n".join(
+    f'### "{key}" ({name})\n{tool_prompt}'
+    for key, (name, tool_prompt, _) in _TOOL_SPECS.items()
+)
+SYS_FULL_KIT = f"""
+You are producing a complete brand kit in one pass.
+
+Return ONLY a JSON object with exactly these keys:
+{_KIT_KEYS}
+
+Every value is a markdown string, except "content_calendar", which is the
+JSON object described in its section spec. Output-format rules inside a
+section spec apply to that section's value only.
+
+SECTION SPECS:
+
+{_KIT_SECTIONS}
+""".strip()
+
+
+def generate_full_brand_kit(
+    answers: Dict[str, Any], context: Optional[str] = None
+) -> Dict[str, str]:
     """
-    Use the LLM to extract structured fields from a free-form brief.
-    Returns a dict with keys matching the UI fields.
+    Generate every tool's output in a single LLM call.
+    Returns {tool key: output} with the same string values the individual
+    generate_* functions return (the content calendar as a JSON string).
+    The kit is cached per context so single-tool callers can share one call.
     """
-    system_prompt = """
-You are a helpful assistant that turns a messy project brief into structured fields.
+    context = _resolve_context(answers, context)
+    system_prompt, user_prompt = _tool_request(context, SYS_FULL_KIT, "full brand kit")
+
+    # Only a kit that parsed is cached, so one malformed reply isn't replayed
+    # for the whole TTL.
+    cache_key, cached = _cached_lookup(
+        _get_llm("kit"), system_prompt, user_prompt, tool="full_kit", cache=True
+    )
+    if cached is not None:
+        return json.loads(cached)
+
+    text = _run_llm_text(system_prompt, user_prompt, tier="kit", cache=False, tool="full_kit")
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Full brand kit response was not valid JSON: {exc}") from exc
+    if not isinstance(data, dict):
+        raise ValueError("Full brand kit response was not a JSON object.")
+
+    kit: Dict[str, str] = {}
+    for key in _TOOL_SPECS:
+        value = data.get(key, "")
+        if key == "content_calendar" and isinstance(value, dict):
+            value = _calendar_json(value.get("entries", []))
+        kit[key] = value if isinstance(value, str) else json.dumps(value)
+
+    _cache_put(cache_key, json.dumps(kit))
+    return kit
 
-Return ONLY valid JSON with this exact structure:
-
-{
-  "client_name": "",
-  "industry": "",
-  "target_audience": "",
-  "goals": "",
-  "brand_vibe": "",
-  "voice_tone": "",
-  "colors": "",
-  "visual_keywords": "",
-  "platforms": "",
-  "reference_links": ""
+
+# --------------------------------------------------------------------
+# Run several tools at once (parallel async fan-out)
+# --------------------------------------------------------------------
+TOOL_MAP = {
+    "brand_discovery": agenerate_brand_discovery_summary,
+    "style_guide": agenerate_brand_style_guide,
+    "content_calendar": agenerate_content_calendar,
+    "logo_directions": agenerate_logo_directions,
+    "logo_sketch_kit": agenerate_logo_sketch_kit,
+    "site_outline": agenerate_site_outline,
+    "project_proposal": agenerate_project_summary_proposal,
+    "color_palette": agenerate_color_palette,
+    "brand_voice": agenerate_brand_voice,
+    "invoice_outline": agenerate_invoice_outline,
+    "domain_taglines": agenerate_domain_and_taglines,
 }
 
-Use empty strings ("") if something is missing or unclear.
-Do NOT add any extra keys or commentary.
-    """.strip()
 
-    user_prompt = f"""
+# Fan-outs at least this wide get a prefix warm-up call first
+PREFIX_WARMUP_MIN_TOOLS = 3
+
+# OpenAI only caches prompts of 1024+ tokens; ~4 chars per token
+_PREFIX_CACHE_MIN_CHARS = 4096
+
+
+async def _awarm_prompt_prefix(context: str) -> None:
+    """
+    Send one tiny request carrying just the shared preamble + client context,
+    so OpenAI has that prefix cached before the parallel calls go out
+    (otherwise they all race and miss the cache together).
+    """
+    messages = _build_messages([SHARED_PREAMBLE, _context_block(context)], "Reply 'ok'.")
+    try:
+        async with _loop_llms() as llms, _llm_semaphore():
+            started = time.perf_counter()
+            response = await llms["creative"].ainvoke(messages, max_tokens=2)
+        _log_llm_call("prefix_warmup", response.usage_metadata, started)
+    except Exception:
+        # Warm-up is best effort; the real calls still run either way
+        pass
+
+
+async def generate_all_tools(
+    answers: Dict[str, Any], which: Optional[List[str]] = None
+) -> Dict[str, str]:
+    """
+    Run several tools concurrently and return {tool name: output}.
+    The context block is built once and shared by every call.
+    Defaults to every tool in TOOL_MAP.
+
+    For wide fan-outs with a cacheable prefix, a warm-up call goes first. It
+    costs one small extra round trip, so it is skipped for small runs and for
+    short contexts that OpenAI would not cache anyway.
+    """
+    names = list(which) if which else list(TOOL_MAP)
+    context = _build_context_text(answers)
+
+    # Tasks started by gather() copy this context, so every call in the run
+    # adds to the same totals dict.
+    totals = _new_usage_totals()
+    token = _USAGE_TOTALS.set(totals)
+    started = time.perf_counter()
+    try:
+        # One HTTP pool for the whole fan-out, closed when the run ends
+        async with _loop_llms():
+            if (
+                len(names) >= PREFIX_WARMUP_MIN_TOOLS
+                and len(SHARED_PREAMBLE) + len(context) >= _PREFIX_CACHE_MIN_CHARS
+            ):
+                await _awarm_prompt_prefix(context)
+            results = await asyncio.gather(*[TOOL_MAP[n](answers, context) for n in names])
+    finally:
+        _USAGE_TOTALS.reset(token)
+        session = {
+            **totals,
+            "tools": len(names),
+            "wall_ms": int((time.perf_counter() - started) * 1000),
+        }
+        logger.info("llm_session %s", session, extra=session)
+    return dict(zip(names, results))
+
+
+def generate_client_kits(
+    answers_list: List[Dict[str, Any]],
+    which: Optional[List[str]] = None,
+    mode: Literal["online", "batch"] = "online",
+) -> List[Dict[str, str]]:
+    """
+    Run tools for many clients; returns one {tool name: output} per client.
+
+    mode="online" fans out live calls right away. mode="batch" goes through the
+    OpenAI Batch API (about half the cost, results within 24h) and blocks until
+    the batch finishes; meant for offline bulk jobs.
+    """
+    if mode == "batch":
+        from openai_batch import run_batch
+
+        return run_batch(answers_list, which)
+
+    async def _run_all() -> List[Dict[str, str]]:
+        # Hold the loop's clients so every run shares one pool
+        async with _loop_llms():
+            return await asyncio.gather(
+                *[generate_all_tools(answers, which) for answers in answers_list]
+            )
+
+    return asyncio.run(_run_all())
+
+
+# --------------------------------------------------------------------
+# 12) Auto-Fill from Brief: parse brief into fields
+# --------------------------------------------------------------------
+SYS_PARSE_BRIEF = """
+You are a helpful assistant that turns a messy project brief into structured fields.
+
+Fill in every field of the schema. Use empty strings ("") if something is
+missing or unclear. Do NOT add commentary.
+""".strip()
+
+USER_PARSE_BRIEF_TMPL = """
 Parse this brief into structured fields.
 
 BRIEF:
 {raw_brief}
 """.strip()
 
-    try:
-        text = _run_llm(system_prompt, user_prompt)
-        data = json.loads(text)
-        if isinstance(data, dict):
-            return data
-    except Exception:
-        pass
 
-    # Fallback: return empty fields
-    return {
-        "client_name": "",
-        "industry": "",
-        "target_audience": "",
-        "goals": "",
-        "brand_vibe": "",
-        "voice_tone": "",
-        "colors": "",
-        "visual_keywords": "",
-        "platforms": "",
-        "reference_links": "",
-    }
+def parse_brief_to_fields(raw_brief: str) -> Dict[str, str]:
+    """
+    Use the LLM to extract structured fields from a free-form brief.
+    Returns a dict with keys matching the UI fields.
+    """
+    fields = _run_structured(
+        SYS_PARSE_BRIEF,
+        USER_PARSE_BRIEF_TMPL.format(raw_brief=raw_brief),
+        BriefFields,
+        tier="json",
+        tool="parse_brief",
+    )
+    return fields.model_dump()
@@ -0,0 +1,158 @@
+import json
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import convert_to_openai_messages
+from openai import OpenAI
+
+from brand_tools import (
+    ContentCalendar,
+    _TOOL_SPECS,
+    _build_context_text,
+    _build_messages,
+    _calendar_json,
+    _get_llm,
+    _spec_request,
+    _tool_tier,
+    load_env,
+)
+
+# --------------------------------------------------------------------
+# OpenAI Batch API path for bulk brand kits
+# --------------------------------------------------------------------
+# For offline jobs (e.g. regenerating kits for many clients overnight) latency
+# doesn't matter but cost does: batch requests are billed at ~50% and don't
+# count against the online rate limits.
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Seconds between status checks while waiting on a batch
+BATCH_POLL_INTERVAL = 30
+
+_BATCH_TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+
+def _openai_client() -> OpenAI:
+    # brand_tools loads .env lazily, so make sure OPENAI_API_KEY is set first
+    load_env()
+    return OpenAI()
+
+
+def build_batch_requests(
+    answers_list: Sequence[Dict[str, Any]], which: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    One Batch API request line per (client, tool).
+    custom_id is "<client index>-<tool key>" so results can be demuxed.
+    """
+    tools = list(which) if which else list(_TOOL_SPECS)
+    requests = []
+    for client_id, answers in enumerate(answers_list):
+        context = _build_context_text(answers)
+        for tool in tools:
+            messages = _build_messages(*_spec_request(tool, context))
+            chat = _get_llm(_tool_tier(tool))
+            body = {
+                "model": chat.model_name,
+                "temperature": chat.temperature,
+                "messages": convert_to_openai_messages(messages),
+            }
+            if tool == "content_calendar":
+                body["response_format"] = {"type": "json_object"}
+            requests.append(
+                {
+                    "custom_id": f"{client_id}-{tool}",
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": body,
+                }
+            )
+    return requests
+
+
+def submit_batch(
+    answers_list: Sequence[Dict[str, Any]],
+    which: Optional[List[str]] = None,
+    client: Optional[OpenAI] = None,
+) -> str:
+    """Upload the request file, create the batch, and return its id."""
+    client = client or _openai_client()
+    lines = build_batch_requests(answers_list, which)
+    payload = "\n".join(json.dumps(line) for line in lines).encode("utf-8")
+
+    batch_file = client.files.create(
+        file=("brand_kits.jsonl", payload), purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW,
+    )
+    return batch.id
+
+
+def wait_for_batch(
+    batch_id: str,
+    client: Optional[OpenAI] = None,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+):
+    """Poll until the batch reaches a terminal state; raise unless it completed."""
+    client = client or _openai_client()
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in _BATCH_TERMINAL_STATES:
+            break
+        time.sleep(poll_interval)
+
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'.")
+    return batch
+
+
+def collect_batch_results(
+    batch, n_clients: int, client: Optional[OpenAI] = None
+) -> List[Dict[str, str]]:
+    """
+    Download a completed batch's output and demux it by custom_id into one
+    {tool key: output} dict per client (same values as the online path).
+    Requests that failed inside the batch are left out of that client's dict;
+    a content calendar that isn't valid JSON is kept as the raw reply.
+    """
+    client = client or _openai_client()
+    results: List[Dict[str, str]] = [{} for _ in range(n_clients)]
+    if not batch.output_file_id:
+        return results
+
+    output = client.files.content(batch.output_file_id).text
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+
+        client_id, tool = record["custom_id"].split("-", 1)
+        text = response["body"]["choices"][0]["message"]["content"]
+        if tool == "content_calendar":
+            try:
+                text = _calendar_json(ContentCalendar.model_validate_json(text).entries)
+            except ValueError:
+                pass  # keep the raw reply; one bad calendar shouldn't sink the batch
+        results[int(client_id)][tool] = text
+
+    return results
+
+
+def run_batch(
+    answers_list: Sequence[Dict[str, Any]],
+    which: Optional[List[str]] = None,
+    client: Optional[OpenAI] = None,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+) -> List[Dict[str, str]]:
+    """Submit, wait, and collect: one result dict per entry in answers_list."""
+    client = client or _openai_client()
+    batch_id = submit_batch(answers_list, which, client)
+    batch = wait_for_batch(batch_id, client, poll_interval)
+    return collect_batch_results(batch, len(answers_list), client)
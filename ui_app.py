@@ -1,75 +1,126 @@
+import asyncio
 import base64
+import functools
+import hashlib
 import io
 import json
+import logging
+import os
+import random
 import re
+import threading
 import zipfile
-from typing import List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
+import httpx
+import orjson
 import pandas as pd
 import streamlit as st
+from cachetools import TTLCache
 from fpdf import FPDF
+from PIL import Image
+import openai
 from openai import OpenAI
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 from brand_tools import (
-    generate_brand_discovery_summary,
-    generate_brand_style_guide,
+    generate_brand_discovery_summary_stream,
+    generate_brand_style_guide_stream,
     generate_content_calendar,
-    generate_logo_directions,
-    generate_logo_sketch_kit,
-    generate_site_outline,
-    generate_project_summary_proposal,
-    generate_color_palette,
-    generate_brand_voice,
-    generate_invoice_outline,
-    generate_domain_and_taglines,
+    generate_logo_directions_stream,
+    generate_logo_sketch_kit_stream,
+    generate_site_outline_stream,
+    generate_project_summary_proposal_stream,
+    generate_color_palette_stream,
+    generate_brand_voice_stream,
+    generate_invoice_outline_stream,
+    generate_domain_and_taglines_stream,
     parse_brief_to_fields,
+    load_env,
 )
 
-client = OpenAI()
+# Show brand_tools' per-call token / cache metrics in the server console
+logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s %(message)s")
+logging.getLogger("brand_tools").setLevel(logging.INFO)
+
+
+@st.cache_resource(show_spinner=False)
+def get_openai_client() -> OpenAI:
+    """
+    One OpenAI client for every session and rerun, so its keep-alive pool
+    (and the TLS handshakes behind it) is reused across calls.
+    """
+    load_env()  # brand_tools reads .env lazily; this client is built first
+    return OpenAI(
+        timeout=60.0,
+        max_retries=2,
+        http_client=openai.DefaultHttpxClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+        ),
+    )
+
+
+client = get_openai_client()
 
 # --------------------------------------------------------------------
-# HELPER: SIMPLE PDF MAKER (with Unicode sanitizing)
+# HELPER: SIMPLE PDF MAKER (Unicode via bundled DejaVu font)
 # --------------------------------------------------------------------
+_FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+_FONT_PATH = os.path.join(_FONT_DIR, "DejaVuSans.ttf")
+_FONT_BOLD_PATH = os.path.join(_FONT_DIR, "DejaVuSans-Bold.ttf")
+
+# FPDF only has glyph widths up to U+FFFF; emoji and other astral-plane
+# characters would crash the PDF output, so they are dropped.
+_NON_BMP_RE = re.compile("[\U00010000-\U0010FFFF]")
+
+
+class _UnicodePDF(FPDF):
+    """
+    FPDF appends every rendered character to the font's glyph subset list,
+    then scans that list once per codepoint while writing glyph widths, which
+    makes long Unicode documents take seconds. Dedupe the subset first.
+    """
+
+    def _putfonts(self):
+        for font in self.fonts.values():
+            if isinstance(font.get("subset"), list):
+                font["subset"] = sorted(set(font["subset"]))
+        super()._putfonts()
+
+
+def _new_pdf() -> FPDF:
+    # add_font() pickles the parsed font metrics next to the .ttf on first
+    # use, so later PDFs only load the pickle instead of re-parsing the font.
+    pdf = _UnicodePDF()
+    pdf.add_font("DejaVu", "", _FONT_PATH, uni=True)
+    pdf.add_font("DejaVu", "B", _FONT_BOLD_PATH, uni=True)
+    return pdf
+
+
 def make_pdf(title: str, body: str) -> bytes:
     """
     Turn plain text into a basic PDF using FPDF.
-    Sanitizes Unicode so latin-1 PDF doesn't explode.
+    Text is rendered with a Unicode TTF, so accents and typographic
+    punctuation come through as-is.
     Returns raw PDF bytes suitable for st.download_button.
     """
+    safe_title = _NON_BMP_RE.sub("", title)
+    safe_body = _NON_BMP_RE.sub("", body)
 
-    def sanitize(text: str) -> str:
-        # Replace “pretty” punctuation with plain ASCII equivalents
-        replacements = {
-            "–": "-",
-            "—": "-",
-            "“": '"',
-            "”": '"',
-            "‘": "'",
-            "’": "'",
-            "…": "...",
-        }
-        for bad, good in replacements.items():
-            text = text.replace(bad, good)
-
-        # Best-effort: drop any remaining characters not in latin-1
-        return text.encode("latin-1", "ignore").decode("latin-1")
-
-    safe_title = sanitize(title)
-    safe_body = sanitize(body)
-
-    pdf = FPDF()
+    pdf = _new_pdf()
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.add_page()
 
     # Title
-    pdf.set_font("Arial", "B", 16)
+    pdf.set_font("DejaVu", "B", 16)
     pdf.multi_cell(0, 10, safe_title)
     pdf.ln(4)
 
-    # Body
-    pdf.set_font("Arial", "", 11)
-    for line in safe_body.split("\n"):
-        pdf.multi_cell(0, 6, line if line.strip() else " ")
+    # Body: one multi_cell (FPDF breaks on \n itself); the spacer keeps
+    # blank lines as visible gaps
+    pdf.set_font("DejaVu", "", 11)
+    pdf.multi_cell(0, 6, safe_body.replace("\n\n", "\n \n"))
 
     raw = pdf.output(dest="S")
     if isinstance(raw, str):
@@ -80,66 +131,256 @@ def make_pdf(title: str, body: str) -> bytes:
     return pdf_bytes
 
 
+# --------------------------------------------------------------------
+# HELPER: Lazy PDF + project folder ZIP
+# --------------------------------------------------------------------
+# Both are handed to st.download_button as callables, so nothing is rendered
+# until the user actually clicks a download.
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_pdf(title: str, body: str) -> bytes:
+    return make_pdf(title, body)
+
+
+@st.cache_data(show_spinner=False, max_entries=20)
+def _build_zip(files: Tuple[Tuple[str, Tuple[str, str]], ...]) -> bytes:
+    """
+    Render (filename, (pdf title, pdf body)) pairs to PDFs and deflate them
+    into one ZIP; cached on the file contents.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as z:
+        for fname, (title, body) in files:
+            z.writestr(fname, _cached_pdf(title, body))
+    return buffer.getvalue()
+
+
 # --------------------------------------------------------------------
 # HELPER: Generate logo moodboard images (AI Logo Sketch Kit)
 # --------------------------------------------------------------------
-def generate_logo_moodboard_images(answers: dict, n: int = 3) -> List[bytes]:
+# Max image requests in flight at once
+IMAGE_CONCURRENCY = 5
+
+# Retries per image on rate limits / transient errors (exponential backoff)
+IMAGE_MAX_RETRIES = 3
+IMAGE_BACKOFF_BASE = 1.0
+
+_RETRYABLE_IMAGE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+async def _generate_one_image(
+    image_client: OpenAI, sem: asyncio.Semaphore, prompt: str
+) -> str:
+    """One single-image request; returns its b64_json payload."""
+    for attempt in range(IMAGE_MAX_RETRIES + 1):
+        try:
+            async with sem:
+                resp = await asyncio.to_thread(
+                    image_client.images.generate,
+                    model="gpt-image-1",
+                    prompt=prompt,
+                    n=1,
+                    size="1024x1024",
+                )
+            return resp.data[0].b64_json
+        except _RETRYABLE_IMAGE_ERRORS:
+            if attempt == IMAGE_MAX_RETRIES:
+                raise
+            await asyncio.sleep(IMAGE_BACKOFF_BASE * 2**attempt + random.random())
+
+
+async def _generate_images(prompt: str, n: int) -> List[bytes]:
     """
-    Use OpenAI images API to generate logo moodboard images.
-    Returns a list of raw image bytes (PNG).
+    Request n images and return them decoded, in completion order.
+    Each payload (~2 MB of base64) is decoded on a small thread pool as soon
+    as it arrives, overlapping with the requests still in flight.
     """
+    # Requests run in worker threads on the shared client: an async client
+    # would be tied to this asyncio.run() loop and lose its pool every call.
+    # SDK retries are off: backoff is handled per image above.
+    image_client = client.with_options(max_retries=0)
+    sem = asyncio.Semaphore(IMAGE_CONCURRENCY)
+    requests = [_generate_one_image(image_client, sem, prompt) for _ in range(n)]
+
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=max(1, min(n, 4))) as pool:
+        decodes = []
+        for next_done in asyncio.as_completed(requests):
+            b64_json = await next_done
+            decodes.append(loop.run_in_executor(pool, base64.b64decode, b64_json))
+        return list(await asyncio.gather(*decodes))
+
+
+def _moodboard_prompt(answers: dict) -> str:
     client_name = answers.get("client_name") or "the brand"
     industry = answers.get("industry") or ""
     vibe = answers.get("brand_vibe") or ""
     colors = answers.get("colors") or ""
     visuals = answers.get("visual_keywords") or ""
 
-    prompt = (
+    return (
         f"Logo moodboard for {client_name} {('in ' + industry) if industry else ''}. "
         f"Brand vibe: {vibe}. Colors: {colors}. Visual keywords: {visuals}. "
         "Show 2D flat logo explorations, clean vector style, centered composition."
     )
 
-    resp = client.images.generate(
-    model="gpt-image-1",
-    prompt=prompt,
-    n=n,
-    size="1024x1024",
+
+def generate_logo_moodboard_images(answers: dict, n: int = 3) -> List[bytes]:
+    """
+    Use OpenAI images API to generate logo moodboard images.
+    The n images are requested concurrently (one image per request), so the
+    wait is about one image's latency instead of n.
+    Returns a list of raw image bytes (PNG).
+    """
+    return _cached_moodboard_images(_moodboard_prompt(answers), n)
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=100)
+def _cached_moodboard_images(prompt: str, n: int) -> List[bytes]:
+    return asyncio.run(_generate_images(prompt, n))
+
+
+def _thumb(img_bytes: bytes, max_side: int = 512, quality: int = 75) -> bytes:
+    """
+    Downscaled JPEG preview of a generated image. The full 1024px PNGs are
+    1-2 MB each and get inlined into the page; a 512px JPEG is a fraction of that.
+    """
+    im = Image.open(io.BytesIO(img_bytes))
+    im.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    buf = io.BytesIO()
+    im.convert("RGB").save(buf, "JPEG", quality=quality, optimize=True)
+    return buf.getvalue()
+
+
+@st.cache_resource
+def _background_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="tru-bg")
+
+
+def start_logo_moodboard_images(answers: dict, n: int = 3) -> "Future[List[bytes]]":
+    """
+    Run generate_logo_moodboard_images on a background thread and return its
+    future, so the images can generate while the sketch-kit text streams.
+    """
+    ctx = get_script_run_ctx()
+
+    def _run() -> List[bytes]:
+        # Lets st.cache_data see the session that started the job
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return generate_logo_moodboard_images(answers, n)
+
+    return _background_pool().submit(_run)
+
+
+# --------------------------------------------------------------------
+# HELPER: Result cache (skip the LLM on repeat submits)
+# --------------------------------------------------------------------
+# Same mode + same answers -> reuse the last output instead of paying for
+# another multi-second call (re-downloading a PDF, switching modes back, ...).
+RESULT_CACHE_TTL = 3600
+RESULT_CACHE_MAX_ENTRIES = 100
+
+ResultKey = Tuple[str, str]
+
+
+@st.cache_resource
+def _result_cache() -> Tuple[TTLCache, threading.Lock]:
+    """
+    (mode, answers hash) -> generated text, shared by all sessions.
+    A plain TTLCache instead of st.cache_data so that misses still stream.
+    """
+    cache = TTLCache(maxsize=RESULT_CACHE_MAX_ENTRIES, ttl=RESULT_CACHE_TTL)
+    return cache, threading.Lock()
+
+
+def _result_key(mode: str, answers: dict) -> ResultKey:
+    answers_json = json.dumps(answers, sort_keys=True, default=str)
+    return mode, hashlib.sha256(answers_json.encode("utf-8")).hexdigest()
+
+
+def _get_cached_result(key: ResultKey) -> Optional[str]:
+    cache, lock = _result_cache()
+    with lock:
+        return cache.get(key)
+
+
+def _store_result(key: ResultKey, text: str) -> None:
+    cache, lock = _result_cache()
+    with lock:
+        cache[key] = text
+
+
+# --------------------------------------------------------------------
+# HELPER: Auto-fill (memoized per brief)
+# --------------------------------------------------------------------
+@st.cache_data(show_spinner=False, max_entries=50, ttl=86400)
+def _cached_parse_brief(brief: str) -> dict:
+    return parse_brief_to_fields(brief)
+
+
+# --------------------------------------------------------------------
+# HELPER: Content calendar table
+# --------------------------------------------------------------------
+_CALENDAR_COLS_IN = ["day", "platform", "post_type", "hook", "visual_direction", "cta"]
+_CALENDAR_COL_MAP = dict(
+    zip(
+        _CALENDAR_COLS_IN,
+        ["Day", "Platform", "Post Type", "Hook / Caption Idea", "Visual Direction", "CTA"],
+    )
 )
 
-    images: List[bytes] = []
-    for item in resp.data:
-        img_bytes = base64.b64decode(item.b64_json)
-        images.append(img_bytes)
+# JSON wrapped in a ```json ... ``` fence
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.S)
+
 
-    return images
+def _extract_json(text: str) -> bytes:
+    """Lift the JSON out of a fenced block if there is one, ready for orjson."""
+    match = _FENCE_RE.search(text)
+    return (match.group(1) if match else text).encode("utf-8")
 
 
 # --------------------------------------------------------------------
 # HELPER: Render color swatches from markdown tables
 # --------------------------------------------------------------------
+# | Name | Role | #HEX | rows from the palette table
+_SWATCH_RE = re.compile(
+    r"\|\s*([^|\n]+?)\s*\|\s*([^|\n]+?)\s*\|\s*#?([0-9A-Fa-f]{6})\s*\|"
+)
+
+# Start of the machine-readable palette section, hidden from the display
+_PALETTE_STRIP_RE = re.compile(r"Palette JSON|```json")
+
+
 def render_color_swatches(markdown_text: str) -> None:
     """
     Look for markdown tables with a HEX column and render visual swatches.
+    All swatches go out in one st.markdown call.
     """
-    pattern = r"\|\s*([^|\n]+?)\s*\|\s*([^|\n]+?)\s*\|\s*#?([0-9A-Fa-f]{6})\s*\|"
-    matches = re.findall(pattern, markdown_text)
+    matches = _SWATCH_RE.findall(markdown_text)
     if not matches:
         return
 
-    st.markdown("#### 🎨 Quick Color Swatches")
+    parts = []
     for name, role, hex_code in matches:
         hex_code = hex_code.upper()
-        st.markdown(
+        parts.append(
             f"""
 <div style="display:flex;align-items:center;margin-bottom:4px;">
   <div style="width:32px;height:18px;background-color:#{hex_code};border-radius:4px;border:1px solid #222;margin-right:8px;"></div>
   <span style="font-size:0.9rem;">{name.strip()} – {role.strip()} – #{hex_code}</span>
 </div>
-""",
-            unsafe_allow_html=True,
+"""
         )
 
+    st.markdown(
+        "#### 🎨 Quick Color Swatches\n" + "".join(parts),
+        unsafe_allow_html=True,
+    )
+
 
 # --------------------------------------------------------------------
 # PAGE CONFIG & BASIC STYLING
@@ -152,8 +393,9 @@ st.set_page_config(
 
 PINK = "#ff3e8e"
 
-st.markdown(
-    f"""
+# Static page chrome, built once. The injectors below are cached, so on a
+# rerun Streamlit replays their elements instead of re-running them.
+_CSS_HTML = f"""
     <style>
     .tru-title-bar {{
         border-bottom: 2px solid {PINK};
@@ -189,9 +431,122 @@ st.markdown(
         color: #ffffff !important;
     }}
     </style>
-    """,
-    unsafe_allow_html=True,
-)
+    """
+
+_HEADER_HTML = """
+<div class="tru-title-bar">
+  <h1>👩‍🎨 Tru Designs Creative Assistant</h1>
+  <p style="color:#cccccc;">
+   I'm a mini creative agent built to help you run brand discovery, style guides,
+    logo concepts, site outlines, and content plans — created by
+    <span class="tru-highlight">Trish Bellardine | Tru Designs</span>.
+  </p>
+</div>
+"""
+
+_FOOTER_HTML = """
+<div class="tru-footer">
+  Developed by <strong>Trish Bellardine</strong> | Tru Designs • 2025<br>
+  <em>Tru Designs Creative Assistant – internal studio tool & portfolio piece.</em>
+</div>
+"""
+
+# mode -> (generator, subheader, caption, button label). Every generator
+# streams Markdown except the calendar's, which returns the full JSON.
+_MODE_TABLE = {
+    "Brand Discovery Summary": (
+        generate_brand_discovery_summary_stream,
+        "📝 Brand Discovery Session",
+        "First pick what you’d like me to generate in the left menu, then paste a brief "
+        "or fill out the intake form below and hit Generate. Voilà — you’ve got an organized "
+        "brand discovery document to start building with.",
+        "Generate Brand Discovery Summary",
+    ),
+    "Brand Style Guide": (
+        generate_brand_style_guide_stream,
+        "🎨 Brand Style Guide Generator",
+        "Get a lite style guide you can refine in Figma / Illustrator.",
+        "Generate Brand Style Guide",
+    ),
+    "Logo Direction Ideas": (
+        generate_logo_directions_stream,
+        "🔖 Logo Direction Ideas",
+        "Strategic logo concept directions and taglines.",
+        "Generate Logo Directions",
+    ),
+    "AI Logo Sketch Kit": (
+        generate_logo_sketch_kit_stream,
+        "✏️ AI Logo Sketch Kit",
+        "Logo sketch concepts + AI moodboard prompts + auto-generated images.",
+        "Generate Logo Sketch Kit",
+    ),
+    "Website / Landing Page Outline": (
+        generate_site_outline_stream,
+        "🕸️ Website / Landing Page Outline",
+        "Generate sitemap ideas and a section-by-section homepage plan.",
+        "Generate Site Outline",
+    ),
+    "Project Summary & Proposal": (
+        generate_project_summary_proposal_stream,
+        "📑 Project Summary & Simple Proposal",
+        "Turn notes into a friendly project overview and scope outline.",
+        "Generate Project Summary & Proposal",
+    ),
+    "Color Palette Generator": (
+        generate_color_palette_stream,
+        "🎯 Color Palette Generator",
+        "Generate HEX palettes and gradients.",
+        "Generate Color Palette",
+    ),
+    "Brand Voice Guide": (
+        generate_brand_voice_stream,
+        "🗣️ Brand Voice Guide",
+        "Define voice pillars, do/don'ts, and channel examples.",
+        "Generate Brand Voice Guide",
+    ),
+    "Proposal → Invoice Outline": (
+        generate_invoice_outline_stream,
+        "💸 Proposal → Invoice Outline",
+        "Turn scope into a simple invoice-style breakdown.",
+        "Generate Invoice Outline",
+    ),
+    "Domain & Tagline Ideas": (
+        generate_domain_and_taglines_stream,
+        "🌐 Domain & Tagline Ideas",
+        "Name and tagline options when clients come in blank.",
+        "Generate Domains & Taglines",
+    ),
+    "30-Day Content Calendar": (
+        generate_content_calendar,
+        "📅 30-Day Content Calendar",
+        "Generate a month of content ideas tailored to the brand vibe.",
+        "Generate 30-Day Content Calendar",
+    ),
+}
+
+# mode -> filename-safe slug for downloads
+_MODE_SLUG = {
+    m: m.replace(" ", "_").replace("→", "to").replace("&", "and").lower()
+    for m in _MODE_TABLE
+}
+
+
+@st.cache_resource
+def _inject_css() -> None:
+    st.markdown(_CSS_HTML, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def _render_header() -> None:
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def _render_footer() -> None:
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
+
+
+_inject_css()
 
 
 # --------------------------------------------------------------------
@@ -200,19 +555,7 @@ st.markdown(
 st.sidebar.title("👩‍🎨 Tru Designs Creative Assistant")
 mode = st.sidebar.radio(
     "What do you want to generate?",
-    (
-        "Brand Discovery Summary",
-        "Brand Style Guide",
-        "Logo Direction Ideas",
-        "AI Logo Sketch Kit",
-        "Website / Landing Page Outline",
-        "Project Summary & Proposal",
-        "Color Palette Generator",
-        "Brand Voice Guide",
-        "Proposal → Invoice Outline",
-        "Domain & Tagline Ideas",
-        "30-Day Content Calendar",
-    ),
+    tuple(_MODE_TABLE),
 )
 
 st.sidebar.markdown(
@@ -228,57 +571,11 @@ This is your **Tru Designs** mini-studio:
 # --------------------------------------------------------------------
 # HEADER
 # --------------------------------------------------------------------
-st.markdown(
-    f"""
-<div class="tru-title-bar">
-  <h1>👩‍🎨 Tru Designs Creative Assistant</h1>
-  <p style="color:#cccccc;">
-   I'm a mini creative agent built to help you run brand discovery, style guides,
-    logo concepts, site outlines, and content plans — created by
-    <span class="tru-highlight">Trish Bellardine | Tru Designs</span>.
-  </p>
-</div>
-""",
-    unsafe_allow_html=True,
-)
+_render_header()
 
-if mode == "Brand Discovery Summary":
-    st.subheader("📝 Brand Discovery Session")
-    st.caption(
-        "First pick what you’d like me to generate in the left menu, then paste a brief "
-        "or fill out the intake form below and hit Generate. Voilà — you’ve got an organized "
-        "brand discovery document to start building with."
-    )
-elif mode == "Brand Style Guide":
-    st.subheader("🎨 Brand Style Guide Generator")
-    st.caption("Get a lite style guide you can refine in Figma / Illustrator.")
-elif mode == "Logo Direction Ideas":
-    st.subheader("🔖 Logo Direction Ideas")
-    st.caption("Strategic logo concept directions and taglines.")
-elif mode == "AI Logo Sketch Kit":
-    st.subheader("✏️ AI Logo Sketch Kit")
-    st.caption("Logo sketch concepts + AI moodboard prompts + auto-generated images.")
-elif mode == "Website / Landing Page Outline":
-    st.subheader("🕸️ Website / Landing Page Outline")
-    st.caption("Generate sitemap ideas and a section-by-section homepage plan.")
-elif mode == "Project Summary & Proposal":
-    st.subheader("📑 Project Summary & Simple Proposal")
-    st.caption("Turn notes into a friendly project overview and scope outline.")
-elif mode == "Color Palette Generator":
-    st.subheader("🎯 Color Palette Generator")
-    st.caption("Generate HEX palettes and gradients.")
-elif mode == "Brand Voice Guide":
-    st.subheader("🗣️ Brand Voice Guide")
-    st.caption("Define voice pillars, do/don'ts, and channel examples.")
-elif mode == "Proposal → Invoice Outline":
-    st.subheader("💸 Proposal → Invoice Outline")
-    st.caption("Turn scope into a simple invoice-style breakdown.")
-elif mode == "Domain & Tagline Ideas":
-    st.subheader("🌐 Domain & Tagline Ideas")
-    st.caption("Name and tagline options when clients come in blank.")
-else:
-    st.subheader("📅 30-Day Content Calendar")
-    st.caption("Generate a month of content ideas tailored to the brand vibe.")
+mode_fn, mode_subheader, mode_caption, button_label = _MODE_TABLE[mode]
+st.subheader(mode_subheader)
+st.caption(mode_caption)
 
 # --------------------------------------------------------------------
 # INTAKE: BRIEF + AUTO-FILL (OUTSIDE FORM)
@@ -299,19 +596,23 @@ if st.button("✨ Auto-fill fields from brief"):
     if not raw_brief.strip():
         st.warning("Please paste a brief first so I can auto-fill.")
     else:
-        data = parse_brief_to_fields(raw_brief)
-        # Set widget state BEFORE they are instantiated
-        st.session_state["client_name_field"] = data.get("client_name", "")
-        st.session_state["industry_field"] = data.get("industry", "")
-        st.session_state["target_audience_field"] = data.get("target_audience", "")
-        st.session_state["goals_field"] = data.get("goals", "")
-        st.session_state["brand_vibe_field"] = data.get("brand_vibe", "")
-        st.session_state["voice_tone_field"] = data.get("voice_tone", "")
-        st.session_state["colors_field"] = data.get("colors", "")
-        st.session_state["visual_keywords_field"] = data.get("visual_keywords", "")
-        st.session_state["platforms_field"] = data.get("platforms", "")
-        st.session_state["reference_links_field"] = data.get("reference_links", "")
-        st.success("Fields auto-filled from brief. You can tweak them below, then hit Generate.")
+        try:
+            data = _cached_parse_brief(raw_brief.strip())
+        except Exception as e:
+            st.warning(f"Auto-fill failed: {e}")
+        else:
+            # Set widget state BEFORE they are instantiated
+            st.session_state["client_name_field"] = data.get("client_name", "")
+            st.session_state["industry_field"] = data.get("industry", "")
+            st.session_state["target_audience_field"] = data.get("target_audience", "")
+            st.session_state["goals_field"] = data.get("goals", "")
+            st.session_state["brand_vibe_field"] = data.get("brand_vibe", "")
+            st.session_state["voice_tone_field"] = data.get("voice_tone", "")
+            st.session_state["colors_field"] = data.get("colors", "")
+            st.session_state["visual_keywords_field"] = data.get("visual_keywords", "")
+            st.session_state["platforms_field"] = data.get("platforms", "")
+            st.session_state["reference_links_field"] = data.get("reference_links", "")
+            st.success("Fields auto-filled from brief. You can tweak them below, then hit Generate.")
 
 # --------------------------------------------------------------------
 # SHARED FORM FOR STRUCTURED FIELDS
@@ -386,20 +687,6 @@ with st.form("brand_form"):
         accept_multiple_files=True,
     )
 
-    button_label = {
-        "Brand Discovery Summary": "Generate Brand Discovery Summary",
-        "Brand Style Guide": "Generate Brand Style Guide",
-        "Logo Direction Ideas": "Generate Logo Directions",
-        "AI Logo Sketch Kit": "Generate Logo Sketch Kit",
-        "Website / Landing Page Outline": "Generate Site Outline",
-        "Project Summary & Proposal": "Generate Project Summary & Proposal",
-        "Color Palette Generator": "Generate Color Palette",
-        "Brand Voice Guide": "Generate Brand Voice Guide",
-        "Proposal → Invoice Outline": "Generate Invoice Outline",
-        "Domain & Tagline Ideas": "Generate Domains & Taglines",
-        "30-Day Content Calendar": "Generate 30-Day Content Calendar",
-    }[mode]
-
     submitted = st.form_submit_button(button_label)
 
 # --------------------------------------------------------------------
@@ -422,32 +709,36 @@ if submitted:
         "visual_keywords": visual_keywords,
         "platforms": platforms,
         "reference_links": reference_links,
-        "uploaded_files": [f.name for f in uploaded_files] if uploaded_files else [],
+        # Lightweight metadata only: file bytes never go to the model.
+        # One entry per distinct filename, sorted, so re-uploads don't repeat
+        # in the prompt and the answers hash doesn't depend on upload order.
+        "uploaded_files": [
+            {"name": name, "size": size}
+            for name, size in sorted(
+                {f.name: f.size for f in uploaded_files or []}.items()
+            )
+        ],
     }
 
-    with st.spinner("Cooking up something creative for you… ✨"):
-        if mode == "Brand Discovery Summary":
-            result = generate_brand_discovery_summary(answers)
-        elif mode == "Brand Style Guide":
-            result = generate_brand_style_guide(answers)
-        elif mode == "Logo Direction Ideas":
-            result = generate_logo_directions(answers)
-        elif mode == "AI Logo Sketch Kit":
-            result = generate_logo_sketch_kit(answers)
-        elif mode == "Website / Landing Page Outline":
-            result = generate_site_outline(answers)
-        elif mode == "Project Summary & Proposal":
-            result = generate_project_summary_proposal(answers)
-        elif mode == "Color Palette Generator":
-            result = generate_color_palette(answers)
-        elif mode == "Brand Voice Guide":
-            result = generate_brand_voice(answers)
-        elif mode == "Proposal → Invoice Outline":
-            result = generate_invoice_outline(answers)
-        elif mode == "Domain & Tagline Ideas":
-            result = generate_domain_and_taglines(answers)
+    # The moodboard images don't depend on the sketch-kit text, so they are
+    # requested now and generate while the text streams (max of the two
+    # latencies instead of the sum).
+    moodboard_future = None
+    if mode == "AI Logo Sketch Kit":
+        moodboard_future = start_logo_moodboard_images(answers, n=3)
+
+    # Markdown outputs stream straight into the page; the calendar is rendered
+    # as a table, so it waits for the full JSON. Repeat submits are served
+    # from the result cache.
+    result_key = _result_key(mode, answers)
+    result = _get_cached_result(result_key)
+    if result is None:
+        if mode == "30-Day Content Calendar":
+            with st.spinner("Cooking up something creative for you… ✨"):
+                result = mode_fn(answers)
+            _store_result(result_key, result)
         else:
-            result = generate_content_calendar(answers)
+            result_stream = mode_fn(answers)
 
     st.markdown("---")
 
@@ -458,19 +749,15 @@ if submitted:
         calendar_text = result
 
         try:
-            data = json.loads(calendar_text)
-            df = pd.DataFrame(data)
-            df = df[
-                ["day", "platform", "post_type", "hook", "visual_direction", "cta"]
-            ]
-            df.columns = [
-                "Day",
-                "Platform",
-                "Post Type",
-                "Hook / Caption Idea",
-                "Visual Direction",
-                "CTA",
-            ]
+            data = orjson.loads(_extract_json(calendar_text))
+            # Missing keys become empty cells instead of a KeyError
+            df = pd.DataFrame(data, columns=_CALENDAR_COLS_IN)
+            # Compact dtypes: day fits in uint8, and the repetitive text
+            # columns store each distinct value once as a category
+            df["day"] = pd.to_numeric(df["day"], errors="coerce", downcast="unsigned")
+            for col in ("platform", "post_type", "cta"):
+                df[col] = df[col].astype("category")
+            df = df.rename(columns=_CALENDAR_COL_MAP)
             st.dataframe(df, use_container_width=True, hide_index=True)
 
             pdf_body = df.to_string(index=False)
@@ -480,16 +767,20 @@ if submitted:
             pdf_body = calendar_text
     else:
         st.subheader("📄 Generated Output")
+        output_slot = st.empty()
+        if result is None:
+            result = output_slot.write_stream(result_stream)
+            _store_result(result_key, result)
+        else:
+            output_slot.markdown(result)
 
         # For color palette: hide any JSON section & show swatches
         display_text = result
         if mode == "Color Palette Generator":
-            if "Palette JSON" in display_text:
-                display_text = display_text.split("Palette JSON")[0].rstrip()
-            if "```json" in display_text:
-                display_text = display_text.split("```json")[0].rstrip()
+            display_text = _PALETTE_STRIP_RE.split(result, maxsplit=1)[0].rstrip()
+            if display_text != result:
+                output_slot.markdown(display_text)
 
-        st.markdown(display_text)
         pdf_body = display_text
 
         if mode == "Color Palette Generator":
@@ -499,10 +790,10 @@ if submitted:
         if mode == "AI Logo Sketch Kit":
             st.markdown("### 🖼️ Logo Moodboard Images")
             try:
-                imgs = generate_logo_moodboard_images(answers, n=3)
+                imgs = moodboard_future.result()
                 img_cols = st.columns(len(imgs))
                 for col, img_bytes in zip(img_cols, imgs):
-                    col.image(img_bytes)
+                    col.image(_thumb(img_bytes))
             except Exception as e:
                 st.warning(f"Image generation failed: {e}")
                 st.info(
@@ -514,36 +805,29 @@ if submitted:
     # ----------------------------------------------------------------
     if pdf_body.strip():
         pdf_title = f"{client_name} - {mode}"
-        pdf_bytes = make_pdf(pdf_title, pdf_body)
 
-        safe_mode_slug = (
-            mode.replace(" ", "_").replace("→", "to").replace("&", "and").lower()
-        )
+        safe_mode_slug = _MODE_SLUG[mode]
         filename = f"{client_name or 'brand'}_{safe_mode_slug}.pdf"
 
         st.download_button(
             label="⬇️ Download as PDF",
-            data=pdf_bytes,
+            data=functools.partial(_cached_pdf, pdf_title, pdf_body),
             file_name=filename,
             mime="application/pdf",
         )
 
-        # Save into session for project ZIP
+        # Save into session for project ZIP (rendered when the ZIP is built)
         if "project_files" not in st.session_state:
             st.session_state["project_files"] = {}
-        st.session_state["project_files"][filename] = pdf_bytes
+        st.session_state["project_files"][filename] = (pdf_title, pdf_body)
 
-    # Project folder export
+    # Project folder export (the ZIP is only built when the button is clicked)
     if st.session_state.get("project_files"):
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, "w") as z:
-            for fname, data_bytes in st.session_state["project_files"].items():
-                z.writestr(fname, data_bytes)
-        buffer.seek(0)
+        project_files = tuple(st.session_state["project_files"].items())
 
         st.download_button(
             label="📁 Download Project Folder (.zip)",
-            data=buffer.getvalue(),
+            data=functools.partial(_build_zip, project_files),
             file_name=f"{client_name or 'client'}_project.zip",
             mime="application/zip",
         )
@@ -551,12 +835,4 @@ if submitted:
 # --------------------------------------------------------------------
 # FOOTER
 # --------------------------------------------------------------------
-st.markdown(
-    """
-<div class="tru-footer">
-  Developed by <strong>Trish Bellardine</strong> | Tru Designs • 2025<br>
-  <em>Tru Designs Creative Assistant – internal studio tool & portfolio piece.</em>
-</div>
-""",
-    unsafe_allow_html=True,
-)
+_render_footer()